@@ -1,11 +1,29 @@
 import json
 import re
+import time
 import datetime as dt
-from typing import Any, Dict, List
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # fall tilbake til stdlib json uten orjson-wheel
+    orjson = None
+
+try:
+    import ciso8601
+except ImportError:  # fall tilbake til pd.to_datetime
+    ciso8601 = None
 
 st.set_page_config(page_title="Øvingslogg", page_icon="⚔️", layout="centered")
 st.title("⚔️ Øvingslogg – juleferien ⚔️")
@@ -26,7 +44,13 @@ MEMBERS = [
 
 MINUTES = [10, 15, 20, 25, 30, 40, 45, 60, 75, 90]
 
-# "Hva øvde du på?" (checkboxes)
+# Oppslag for selectbox-index, i stedet for list.index() på hver rerun
+MEMBER_INDEX = {m: i for i, m in enumerate(MEMBERS)}
+MINUTES_INDEX = {m: i for i, m in enumerate(MINUTES)}
+DEFAULT_MINUTES_INDEX = MINUTES_INDEX[30]
+
+# "Hva øvde du på?" (multiselect)
+# NB: lagres som bitmaske på indeks – bare legg til nye punkter på slutten
 PRACTICE_ITEMS = [
     "Oppvarming",
     "Stemmeøvelser",
@@ -52,93 +76,425 @@ PRACTICE_ITEMS = [
 BEGIN = "OVINGSLOGG_V1_BEGIN"
 END = "OVINGSLOGG_V1_END"
 
+PER_PAGE = 100
+
+# Sekunder før en cachet logg lastes på nytt selv om versjonen er uendret
+LOG_TTL = 30
+
+LOG_COLUMNS = ["ts", "date", "member", "minutes", "practiced"]
+EMPTY_LOG_DF = pd.DataFrame(columns=LOG_COLUMNS)
+
+TS_FORMAT = "%Y-%m-%dT%H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+
+# Payload er enten én oppføring (eldre kommentarer) eller en liste med oppføringer
+_ENTRY_RE = re.compile(rf"{BEGIN}\s*```json\s*(\{{.*?\}}|\[.*?\])\s*```\s*{END}", re.DOTALL)
+
+# Maks antall oppføringer per kommentar før en ny kommentar startes
+BATCH_SIZE = 50
+
 # ----------------------------
 # GitHub helpers
 # ----------------------------
-def gh_headers() -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {st.secrets['GITHUB_TOKEN']}",
+# Les secrets én gang per kjøring i stedet for ved hvert HTTP-kall
+_GH_OWNER = st.secrets["GITHUB_OWNER"]
+_GH_REPO = st.secrets["GITHUB_REPO"]
+_GH_TOKEN = st.secrets["GITHUB_TOKEN"]
+_GH_BASE = f"https://api.github.com/repos/{_GH_OWNER}/{_GH_REPO}"
+
+@st.cache_resource
+def _gh_session() -> requests.Session:
+    # Én delt session for alle kall, så TCP/TLS-tilkoblingen gjenbrukes
+    s = requests.Session()
+    s.headers.update({
+        "Authorization": f"Bearer {_GH_TOKEN}",
         "Accept": "application/vnd.github+json",
         "User-Agent": "streamlit-ovingslogg",
-    }
-
-def gh_base() -> str:
-    owner = st.secrets["GITHUB_OWNER"]
-    repo = st.secrets["GITHUB_REPO"]
-    return f"https://api.github.com/repos/{owner}/{repo}"
+    })
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return s
 
 def post_issue_comment(issue_number: int, body: str) -> None:
-    url = f"{gh_base()}/issues/{issue_number}/comments"
-    r = requests.post(url, headers=gh_headers(), json={"body": body}, timeout=20)
+    url = f"{_GH_BASE}/issues/{issue_number}/comments"
+    r = _gh_session().post(url, json={"body": body}, timeout=20)
+    r.raise_for_status()
+
+def update_issue_comment(comment_id: int, body: str) -> None:
+    url = f"{_GH_BASE}/issues/comments/{comment_id}"
+    r = _gh_session().patch(url, json={"body": body}, timeout=20)
+    r.raise_for_status()
+
+def get_issue_comment(comment_id: int) -> Dict[str, Any]:
+    url = f"{_GH_BASE}/issues/comments/{comment_id}"
+    r = _gh_session().get(url, timeout=20)
+    r.raise_for_status()
+    return _json_loads(r.content)
+
+@st.cache_resource
+def _token_login() -> str:
+    r = _gh_session().get("https://api.github.com/user", timeout=20)
     r.raise_for_status()
+    return _json_loads(r.content)["login"]
+
+def token_login() -> Optional[str]:
+    # None (f.eks. app-token uten /user) betyr at vi bare poster nye kommentarer
+    try:
+        return _token_login()
+    except (requests.RequestException, KeyError):
+        return None
+
+@st.cache_resource
+def _page_cache() -> Dict[Tuple[int, int], Tuple[str, List[Dict[str, Any]], int]]:
+    # (issue_number, page) -> (etag, kommentarer, siste side)
+    return {}
+
+@st.cache_resource
+def _last_page_hints() -> Dict[int, int]:
+    # issue_number -> høyeste kjente side med kommentarer. Side 1 gir 304 så
+    # lenge den er full, så Link-hintet derfra alene blir aldri oppdatert.
+    return {}
+
+def _last_filled_page(pages: List[Tuple[int, List[Dict[str, Any]]]]) -> Optional[int]:
+    filled = [page for page, batch in pages if batch]
+    return max(filled) if filled else None
+
+def _last_page(r: requests.Response, page: int) -> int:
+    last = r.links.get("last")
+    if not last:
+        return page
+    query = parse_qs(urlparse(last["url"]).query)
+    return int(query.get("page", [page])[0])
+
+def _get_comments_page(
+    session: requests.Session,
+    cache: Dict[Tuple[int, int], Tuple[str, List[Dict[str, Any]], int]],
+    url: str,
+    key: Tuple[int, int],
+) -> Tuple[List[Dict[str, Any]], int]:
+    # Kjøres også i tråder, så session/cache/url sendes inn i stedet for st.*-oppslag
+    cached = cache.get(key)
+    # 304-svar teller ikke mot rate limit og sender ingen body
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    r = session.get(
+        url,
+        headers=headers,
+        params={"per_page": PER_PAGE, "page": key[1]},
+        timeout=20,
+    )
+    if r.status_code == 304 and cached:
+        # Bruk Link fra 304-svaret hvis GitHub sender den, ellers det lagrede hintet
+        return cached[1], _last_page(r, key[1]) if r.links else cached[2]
+    r.raise_for_status()
+    batch = _json_loads(r.content)  # orjson parser bytes direkte
+    last = _last_page(r, key[1])
+    etag = r.headers.get("ETag")
+    if etag:
+        cache[key] = (etag, batch, last)
+    return batch, last
 
 def list_issue_comments(issue_number: int) -> List[Dict[str, Any]]:
-    all_comments: List[Dict[str, Any]] = []
-    page = 1
-    while True:
-        url = f"{gh_base()}/issues/{issue_number}/comments"
-        r = requests.get(
-            url,
-            headers=gh_headers(),
-            params={"per_page": 100, "page": page},
-            timeout=20,
-        )
-        r.raise_for_status()
-        batch = r.json()
-        if not batch:
-            break
-        all_comments.extend(batch)
+    session = _gh_session()
+    cache = _page_cache()
+    url = f"{_GH_BASE}/issues/{issue_number}/comments"
+
+    def get_page(page: int) -> Tuple[List[Dict[str, Any]], int]:
+        return _get_comments_page(session, cache, url, (issue_number, page))
+
+    hints = _last_page_hints()
+
+    # Side 1 først for å få antall sider fra Link-headeren, resten parallelt
+    batch, last = get_page(1)
+    last = max(last, hints.get(issue_number, 1))
+    batches = [batch]
+    if last > 1:
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            batches.extend(b for b, _ in ex.map(get_page, range(2, last + 1)))
+
+    # Link fra en cachet side kan være utdatert – fortsett så lenge siste side er full
+    page = last
+    while len(batches[-1]) >= PER_PAGE:
         page += 1
-    return all_comments
-
-def encode_entry_as_comment(entry: Dict[str, Any]) -> str:
-    payload = json.dumps(entry, ensure_ascii=False)
+        batch, _ = get_page(page)
+        batches.append(batch)
+
+    hints[issue_number] = _last_filled_page(list(enumerate(batches, start=1))) or 1
+    return [c for b in batches for c in b]
+
+def _log_tail(
+    issue_number: int, start: Optional[int] = None
+) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    # Siste side(r) av kommentarene som (side, kommentarer), med betingede GETs.
+    # start tvinger første side, f.eks. for å sammenligne med en tidligere tail.
+    session = _gh_session()
+    cache = _page_cache()
+    url = f"{_GH_BASE}/issues/{issue_number}/comments"
+    hints = _last_page_hints()
+
+    def get_page(page: int) -> List[Dict[str, Any]]:
+        batch, _ = _get_comments_page(session, cache, url, (issue_number, page))
+        return batch
+
+    batch: Optional[List[Dict[str, Any]]] = None
+    if start is not None:
+        page = start
+    elif issue_number in hints:
+        page = hints[issue_number]
+    else:
+        # Kald cache: side 1 forteller hvor siste side er, så vi hopper rett dit
+        first, page = _get_comments_page(session, cache, url, (issue_number, 1))
+        if page == 1:
+            batch = first
+    if batch is None:
+        batch = get_page(page)
+    while start is None and not batch and page > 1:  # kommentarer kan være slettet
+        page -= 1
+        batch = get_page(page)
+    tail = [(page, batch)]
+    while len(batch) >= PER_PAGE:  # ny side kan ha kommet til
+        page += 1
+        batch = get_page(page)
+        tail.append((page, batch))
+
+    filled = _last_filled_page(tail)
+    if filled is not None:
+        hints[issue_number] = filled
+    return tail
+
+def log_version(issue_number: int) -> str:
+    # Billig sjekk: betingede GETs av siste side(r) (304 er gratis).
+    # Nye økter PATCHes inn i en kommentar på disse sidene, og det flytter ikke
+    # alltid issuets updated_at – ETagen til siden som endres gjør det.
+    return _tail_version(issue_number, _log_tail(issue_number))
+
+def _tail_version(issue_number: int, tail: List[Tuple[int, List[Dict[str, Any]]]]) -> str:
+    # Alle sidene i tail, siden _open_batch kan PATCHe en kommentar på hvilken som helst
+    cache = _page_cache()
+    return "|".join(f"{page}:{cache.get((issue_number, page), ('',))[0]}" for page, _ in tail)
+
+def _json_dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False)
+
+def _json_loads(raw: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def encode_entries_as_comment(entries: List[Dict[str, Any]]) -> str:
+    payload = _json_dumps(entries)
     return f"{BEGIN}\n```json\n{payload}\n```\n{END}"
 
+def encode_practiced(practiced: List[str]) -> int:
+    return sum(1 << i for i, opt in enumerate(PRACTICE_ITEMS) if opt in practiced)
+
+def decode_practiced(mask: int) -> str:
+    return ", ".join(opt for i, opt in enumerate(PRACTICE_ITEMS) if mask >> i & 1)
+
+def parse_comment_entries(body: str) -> Optional[List[Dict[str, Any]]]:
+    # None betyr at kommentaren ikke er en loggkommentar
+    # Rask substring-sjekk før regex, så vanlige kommentarer hoppes over
+    if BEGIN not in body:
+        return None
+    m = _ENTRY_RE.search(body)
+    if not m:
+        return None
+    try:
+        data = _json_loads(m.group(1))
+    except ValueError:  # json.JSONDecodeError og orjson.JSONDecodeError
+        return None
+    if isinstance(data, dict):
+        return [data]
+    if isinstance(data, list):
+        return data
+    return None
+
 def extract_entries_from_comments(comments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     entries: List[Dict[str, Any]] = []
-    pattern = re.compile(rf"{BEGIN}\s*```json\s*(\{{.*?\}})\s*```\s*{END}", re.DOTALL)
 
     for c in comments:
-        body = c.get("body", "") or ""
-        m = pattern.search(body)
-        if not m:
+        batch = parse_comment_entries(c.get("body", "") or "")
+        if batch:
+            entries.extend(batch)
+
+    return entries
+
+def _open_batch(
+    comments: List[Dict[str, Any]], entry: Dict[str, Any]
+) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    # Nyeste loggkommentar fra vårt eget token med bare dette medlemmets økter.
+    # Én batch per medlem gjør at i praksis bare én person skriver til hver kommentar.
+    login = token_login()
+    if login is None:
+        return None
+    for c in reversed(comments):
+        if (c.get("user") or {}).get("login") != login:
             continue
-        raw = m.group(1)
-        try:
-            entries.append(json.loads(raw))
-        except json.JSONDecodeError:
+        batch = parse_comment_entries(c.get("body", "") or "")
+        if not batch or any(e.get("member") != entry["member"] for e in batch):
             continue
+        return (c, batch) if len(batch) < BATCH_SIZE else None
+    return None
+
+def append_entry(
+    issue_number: int,
+    entry: Dict[str, Any],
+    tail: Optional[List[Tuple[int, List[Dict[str, Any]]]]] = None,
+) -> None:
+    # Fyll opp medlemmets åpne loggkommentar på siste side(r) i stedet for
+    # én kommentar per økt, så lesing trenger ~BATCH_SIZE ganger færre sider
+    if tail is None:
+        tail = _log_tail(issue_number)
+    comments = [c for _, batch in tail for c in batch]
+    target = _open_batch(comments, entry)
+    if target is not None:
+        comment, batch = target
+        try:
+            update_issue_comment(comment["id"], encode_entries_as_comment(batch + [entry]))
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code not in (403, 404, 422):
+                raise
+        else:
+            # PATCH har ingen konfliktsjekk – les tilbake og sjekk at økta ble stående
+            try:
+                saved = parse_comment_entries(get_issue_comment(comment["id"]).get("body") or "")
+            except requests.RequestException:
+                return  # PATCH gikk gjennom; ikke rapporter lagringen som feilet
+            if saved and entry in saved:
+                return
+    post_issue_comment(issue_number, encode_entries_as_comment([entry]))
+
+def _parse_ts(raw: Any) -> Optional[dt.datetime]:
+    try:
+        return ciso8601.parse_datetime_as_naive(raw)
+    except (TypeError, ValueError):
+        return None
 
-    return entries
+def entries_to_df(entries: List[Dict[str, Any]]) -> pd.DataFrame:
+    if not entries:
+        return pd.DataFrame(columns=LOG_COLUMNS)
+
+    # Bygg kolonnevis i én runde – raskere enn pd.DataFrame(list_of_dicts)
+    ts, date, member, minutes, practiced_raw, masks = [], [], [], [], [], []
+    parse_ts = _parse_ts if ciso8601 is not None else lambda raw: raw
+    for e in entries:
+        ts.append(parse_ts(e.get("ts")))
+        date.append(e.get("date"))
+        member.append(e.get("member"))
+        minutes.append(e.get("minutes"))
+        practiced_raw.append(e.get("practiced"))
+        masks.append(e.get("p"))
+    df = pd.DataFrame({
+        # Ferdig parset med ciso8601 → ingen pd.to_datetime nødvendig
+        "ts": np.array(ts, dtype="datetime64[s]") if ciso8601 is not None else ts,
+        "date": date,
+        "member": member,
+        "minutes": minutes,
+        "practiced": practiced_raw,
+        "p": masks,
+    })
+    # Vi skriver selv ts/date med isoformat(), så formatet er kjent
+    if ciso8601 is None:
+        df["ts"] = pd.to_datetime(df["ts"], format=TS_FORMAT, errors="coerce", cache=True)
+    df["date"] = pd.to_datetime(df["date"], format=DATE_FORMAT, errors="coerce", cache=True).dt.date
+    df["minutes"] = pd.to_numeric(df["minutes"], errors="coerce").fillna(0).astype(int)
+
+    # v1: liste med titler (ikke-lister blir tomme lister før str.join)
+    is_list = df["practiced"].map(type).eq(list)
+    practiced = df["practiced"].where(is_list, pd.Series([[]] * len(df), index=df.index))
+    practiced = practiced.str.join(", ")
+    # v2: bitmaske over PRACTICE_ITEMS; ugyldige verdier behandles som "ingen maske"
+    masks = pd.to_numeric(df["p"], errors="coerce").astype(float)
+    has_mask = masks.notna() & np.isfinite(masks) & (masks >= 0)
+    # Få unike masker i praksis, så dekod hver bare én gang
+    labels = {m: decode_practiced(int(m)) for m in masks[has_mask].unique()}
+    df["practiced"] = practiced.mask(has_mask, masks.map(labels))
+
+    # Arrow-baserte dtypes, så st.dataframe slipper objekt→Arrow-konvertering per rerun
+    df["date"] = df["date"].astype(pd.ArrowDtype(pa.date32()))
+    df["member"] = df["member"].astype("string[pyarrow]")
+    df["minutes"] = df["minutes"].astype("int16[pyarrow]")
+    df["practiced"] = df["practiced"].astype("string[pyarrow]")
+    return df
 
-@st.cache_data(ttl=30)
 def load_log_df(issue_number: int) -> pd.DataFrame:
     comments = list_issue_comments(issue_number)
-    entries = extract_entries_from_comments(comments)
-    if not entries:
-        return pd.DataFrame(columns=["ts", "date", "member", "minutes", "practiced"])
+    return entries_to_df(extract_entries_from_comments(comments))
 
-    df = pd.DataFrame(entries)
-    df["ts"] = pd.to_datetime(df["ts"], errors="coerce")
-    df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.date
-    df["minutes"] = pd.to_numeric(df["minutes"], errors="coerce").fillna(0).astype(int)
-    return df
+def build_log_index(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    df = df.sort_values("ts", ascending=False)
+    return {m: g for m, g in df.groupby("member", sort=False)}
+
+# cache_resource: samme dict returneres uten kopiering, så oppslag per medlem er O(1).
+# version er bare cache-nøkkel (se log_version) – uendret versjon gir treff uten HTTP.
+@st.cache_resource(ttl=LOG_TTL, max_entries=4)
+def load_log_index(issue_number: int, version: str) -> Tuple[Dict[str, pd.DataFrame], float]:
+    return build_log_index(load_log_df(issue_number)), time.monotonic()
+
+@st.cache_resource
+def _known_index() -> Dict[int, Tuple[str, Dict[str, pd.DataFrame], float]]:
+    # issue_number -> (versjon, indeks, lastet) for sist brukte indeks, så egen
+    # økt kan legges inn etter lagring uten å laste loggen på nytt
+    return {}
+
+def log_index_for(issue_number: int, version: str) -> Dict[str, pd.DataFrame]:
+    known = _known_index().get(issue_number)
+    if known is not None and known[0] == version and time.monotonic() - known[2] < LOG_TTL:
+        return known[1]
+    index, loaded_at = load_log_index(issue_number, version)
+    _known_index()[issue_number] = (version, index, loaded_at)
+    return index
+
+def current_log_index(issue_number: int) -> Dict[str, pd.DataFrame]:
+    return log_index_for(issue_number, log_version(issue_number))
+
+def with_entry(index: Dict[str, pd.DataFrame], entry: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    # Ny dict i stedet for å endre en cachet indeks som andre sesjoner leser
+    index = dict(index)
+    row = entries_to_df([entry])
+    old = index.get(entry["member"])
+    index[entry["member"]] = row if old is None else pd.concat([row, old], ignore_index=True)
+    return index
+
+def _tail_entry_keys(tail: List[Tuple[int, List[Dict[str, Any]]]]) -> Counter:
+    comments = [c for _, batch in tail for c in batch]
+    return Counter(json.dumps(e, sort_keys=True) for e in extract_entries_from_comments(comments))
+
+def remember_own_entry(
+    issue_number: int,
+    before: List[Tuple[int, List[Dict[str, Any]]]],
+    entry: Dict[str, Any],
+) -> None:
+    # Gjenbruk indeksen bare hvis den allerede er lastet for versjonen `before`,
+    # og egen økt er den eneste endringen siden; ellers bommer versjonen og
+    # loggen lastes på nytt (billig med ETag-cachen)
+    known = _known_index().get(issue_number)
+    if not before or known is None or known[0] != _tail_version(issue_number, before):
+        return
+    version, index, loaded_at = known
+    if time.monotonic() - loaded_at >= LOG_TTL:
+        return
+    after = _log_tail(issue_number, start=before[0][0])
+    expected = _tail_entry_keys(before)
+    expected[json.dumps(entry, sort_keys=True)] += 1
+    if _tail_entry_keys(after) != expected:
+        return
+    # Beholder opprinnelig lastetid, så ttl-sikkerhetsnettet ikke forlenges
+    _known_index()[issue_number] = (
+        _tail_version(issue_number, after), with_entry(index, entry), loaded_at
+    )
 
-def render_member_log(issue_number: int, member_name: str) -> None:
+def render_member_log(index: Dict[str, pd.DataFrame], member_name: str) -> None:
     st.divider()
     st.subheader(f"📒 Øvingslogg – {member_name}")
 
-    df = load_log_df(issue_number)
-    df = df[df["member"] == member_name].copy()
+    df = index.get(member_name, EMPTY_LOG_DF)
 
     if df.empty:
         st.info("Ingen økter logget ennå.")
         return
 
-    df = df.sort_values("ts", ascending=False)
-    df["practiced"] = df["practiced"].apply(lambda x: ", ".join(x) if isinstance(x, list) else "")
-
     st.dataframe(df[["date", "minutes", "practiced"]], use_container_width=True)
 
     st.subheader("📊 Oppsummering")
@@ -152,6 +508,8 @@ if "show_log" not in st.session_state:
     st.session_state.show_log = False
 if "selected_member" not in st.session_state:
     st.session_state.selected_member = MEMBERS[0]
+if "is_admin" not in st.session_state:
+    st.session_state.is_admin = False
 
 # ----------------------------
 # UI
@@ -159,15 +517,10 @@ if "selected_member" not in st.session_state:
 issue_number = int(st.secrets["GITHUB_ISSUE_NUMBER"])
 
 with st.form("logg", clear_on_submit=True):
-    member = st.selectbox("Hvem er du?", MEMBERS, index=MEMBERS.index(st.session_state.selected_member))
-    minutes = st.selectbox("Hvor lenge øvde du?", MINUTES, index=MINUTES.index(30))
+    member = st.selectbox("Hvem er du?", MEMBERS, index=MEMBER_INDEX[st.session_state.selected_member])
+    minutes = st.selectbox("Hvor lenge øvde du?", MINUTES, index=DEFAULT_MINUTES_INDEX)
 
-    st.write("Hva øvde du på?")
-    practiced = []
-    cols = st.columns(2)
-    for i, opt in enumerate(PRACTICE_ITEMS):
-        if cols[i % 2].checkbox(opt, value=False):
-            practiced.append(opt)
+    practiced = st.multiselect("Hva øvde du på?", PRACTICE_ITEMS, default=[])
 
     col_a, col_b = st.columns(2)
     submit = col_a.form_submit_button("✅ Logg øving")
@@ -185,29 +538,47 @@ if show_log:
 # Logg øving
 if submit:
     entry = {
-        "v": 1,
+        "v": 2,
         "ts": dt.datetime.now().isoformat(timespec="seconds"),
         "date": dt.date.today().isoformat(),
         "member": member,
         "minutes": int(minutes),
-        "practiced": practiced,
+        "p": encode_practiced(practiced),
     }
 
+    # Bare siste side(r) før lagring – feil her skal ikke hindre at økta lagres
     try:
-        post_issue_comment(issue_number, encode_entry_as_comment(entry))
-        st.success("Logget! 🎉")
-        load_log_df.clear()  # sørg for at ny logg kommer med
+        tail = _log_tail(issue_number)
+    except requests.RequestException:
+        tail = []  # ingen åpen batch å fylle; append_entry poster en ny kommentar
 
-        st.session_state.show_log = True  # vis logg etter submit også
-        st.rerun()
+    try:
+        append_entry(issue_number, entry, tail)
     except requests.HTTPError as e:
         st.error(f"Klarte ikke å lagre til GitHub (HTTP-feil). {e}")
     except Exception as e:
         st.error(f"Noe gikk galt: {e}")
+    else:
+        st.success("Logget! 🎉")
+        # Legg ny økt inn lokalt i stedet for å laste hele loggen på nytt
+        try:
+            remember_own_entry(issue_number, tail, entry)
+        except Exception:
+            pass  # økta er lagret; neste visning laster bare loggen på nytt
+
+        st.session_state.show_log = True  # vis logg etter submit også
+        st.rerun()
+
+# Versjonssjekk én gang per kjøring, delt av medlemslogg og admin
+log_index = (
+    current_log_index(issue_number)
+    if st.session_state.show_log or st.session_state.is_admin
+    else {}
+)
 
 # Vis individuell logg (kun hvis bruker har trykket "Vis logg" eller har logget)
 if st.session_state.show_log and st.session_state.selected_member:
-    render_member_log(issue_number, st.session_state.selected_member)
+    render_member_log(log_index, st.session_state.selected_member)
 
 # ----------------------------
 # Admin: leaderboard bak passord
@@ -215,9 +586,6 @@ if st.session_state.show_log and st.session_state.selected_member:
 st.divider()
 st.subheader("🔒 Admin")
 
-if "is_admin" not in st.session_state:
-    st.session_state.is_admin = False
-
 if not st.session_state.is_admin:
     pwd = st.text_input("Admin-passord", type="password")
     if st.button("Logg inn som admin"):
@@ -234,24 +602,22 @@ else:
         st.rerun()
 
     # Last alle logger og vis leaderboard
-    df_all = load_log_df(issue_number)
+    # Indeksen er allerede gruppert per medlem
+    groups = list(log_index.items())
 
-    if df_all.empty:
+    if not groups:
         st.info("Ingen logger ennå.")
     else:
         st.subheader("🏆 Leaderboard (totale minutter)")
-        lb = (
-            df_all.groupby("member", as_index=False)["minutes"]
-            .sum()
-            .sort_values("minutes", ascending=False)
-        )
+        lb = pd.DataFrame({
+            "member": [m for m, _ in groups],
+            "minutes": [int(g["minutes"].sum()) for _, g in groups],
+        }).sort_values("minutes", ascending=False)
         st.dataframe(lb, use_container_width=True)
 
         st.subheader("📈 Antall økter")
-        sessions = (
-            df_all.groupby("member", as_index=False)
-            .size()
-            .rename(columns={"size": "økter"})
-            .sort_values("økter", ascending=False)
-        )
+        sessions = pd.DataFrame({
+            "member": [m for m, _ in groups],
+            "økter": [len(g) for _, g in groups],
+        }).sort_values("økter", ascending=False)
         st.dataframe(sessions, use_container_width=True)